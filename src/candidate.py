@@ -8,14 +8,17 @@ pattern's canonical code.
 
 from __future__ import annotations
 
-from typing import Iterator, List, Set, Tuple, Optional, Dict, TYPE_CHECKING
+from typing import AbstractSet, Iterator, List, Set, Tuple, Optional, Dict, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
 from graph import Edge, DataGraph
 from pattern import Pattern
-from canonical import _CanonDFSHelper
 
 if TYPE_CHECKING:
     from miner import SoGraMiHeuristics
 
+# below this many embeddings a process pool costs more than it saves
+PARALLEL_MIN_EMBEDDINGS = 2048
+
 
 class CandidateGenerator:
     """Produce initial seeds and one-edge extensions for a pattern.
@@ -27,8 +30,9 @@ class CandidateGenerator:
     key.
     """
 
-    def __init__(self, G: DataGraph):
+    def __init__(self, G: DataGraph, max_workers: int = 1):
         self.G = G
+        self.max_workers = max_workers
 
     def seed_patterns(self) -> Iterator[Pattern]:
         seen: Set[Tuple] = set()
@@ -60,10 +64,15 @@ class CandidateGenerator:
 
         The rmpath is used to determine where to attach new edges when
         generating extensions (standard trick from graph mining literature).
+        The canonical code is already part of `p.key`, and the resulting
+        path is cached on the pattern since patterns are never mutated.
         """
-        code = _CanonDFSHelper(p.directed, p.vlabels, p.edges).canonical_code()
+        if p._rmpath_cache is not None:
+            return p._rmpath_cache
+        code = p.key[1]
         if not code:
-            return list(range(p.num_nodes()))
+            p._rmpath_cache = list(range(p.num_nodes()))
+            return p._rmpath_cache
         seen: Set[int] = set()
         parent: Dict[int, int] = {}
         for frm_idx, to_idx, *_ in code:
@@ -77,6 +86,7 @@ class CandidateGenerator:
         while path[-1] in parent:
             path.append(parent[path[-1]])
         path.reverse()
+        p._rmpath_cache = path
         return path
 
     def extensions(
@@ -84,7 +94,9 @@ class CandidateGenerator:
         p: Pattern,
         embeddings: List[Dict[int, int]],
         heur: Optional["SoGraMiHeuristics"] = None,
-        allowed_edge_types: Optional[Set[Tuple[str, str, Optional[str], int]]] = None,
+        allowed_edge_types: Optional[AbstractSet[Tuple[str, str, Optional[str], int]]] = None,
+        parallel: bool = False,
+        executor: Optional[ProcessPoolExecutor] = None,
     ) -> Iterator[Pattern]:
         """Yield candidate one-edge extensions for pattern `p`.
 
@@ -94,17 +106,58 @@ class CandidateGenerator:
           heuristics to reduce search.
         - `allowed_edge_types` is an optional pre-filter of edge types
           (label-label-edgeLabel-directedFlag) used by SoPaGraMi.
+        - `parallel` splits large embedding lists into `max_workers`
+          contiguous chunks evaluated on `executor`, which must be a miner
+          worker pool whose initializer installed the worker-side generator
+          (and heuristics, if `heur` is given) through `_init_extend_worker`;
+          without an executor the work stays serial. Chunk results are
+          merged in order, so the yielded sequence matches the serial one.
         """
+        if (not parallel or executor is None or self.max_workers <= 1
+                or len(embeddings) < PARALLEL_MIN_EMBEDDINGS):
+            yield from self._extend(p, embeddings, heur, allowed_edge_types)
+            return
+        size = -(-len(embeddings) // self.max_workers)
+        chunks = [embeddings[i:i + size] for i in range(0, len(embeddings), size)]
         produced: Set[Tuple] = set()
+        futs = [executor.submit(_extend_chunk, p, chunk, allowed_edge_types, heur is not None)
+                for chunk in chunks]
+        for fut in futs:
+            for q in fut.result():
+                if q.key not in produced:
+                    produced.add(q.key)
+                    yield q
+
+    def _extend(
+        self,
+        p: Pattern,
+        embeddings: List[Dict[int, int]],
+        heur: Optional["SoGraMiHeuristics"],
+        allowed_edge_types: Optional[AbstractSet[Tuple[str, str, Optional[str], int]]],
+    ) -> Iterator[Pattern]:
+        """Serial extension loop behind `extensions` (see there)."""
+        # Phase 1 collects (edge, new vertex label) descriptors, kept in
+        # first-seen order by an insertion-ordered dict. A descriptor always
+        # yields the same pattern, so repeats are dropped before paying for
+        # a Pattern and its canonical key.
+        pending: Dict[Tuple[Edge, Optional[str]], None] = {}
         existing = p.edge_set()
+
+        def add(edge: Edge, lv: Optional[str]):
+            pending[(edge, lv)] = None
+
         rmpath = self._rmpath(p) or list(range(p.num_nodes()))
         rm = rmpath[-1]
         ancestors = rmpath[:-1]
 
-        def pat_deg(u_p: int) -> int:
-            return sum(1 for e in p.edges if e.u == u_p or e.v == u_p)
+        deg_p = [0] * p.num_nodes()
+        for u in p.edges_u:
+            deg_p[u] += 1
+        for v in p.edges_v:
+            deg_p[v] += 1
 
         for emb in embeddings:
+            used_vals = set(emb.values())
             u_p = rm
             u_g = emb.get(u_p)
             if u_g is not None:
@@ -113,50 +166,35 @@ class CandidateGenerator:
                     if w_g is None:
                         continue
                     if not p.directed:
-                        if self.G.has_edge(u_g, w_g, None) or self.G.has_edge(w_g, u_g, None):
-                            labs = [lab for (v2, lab) in self.G.adj[u_g] if v2 == w_g]
-                            if not labs:
-                                labs = [lab for (v2, lab) in self.G.adj[w_g] if v2 == u_g]
-                            for elab in labs:
-                                a, b = (min(u_p, w_p), max(u_p, w_p))
-                                if (a, b, elab) in existing:
+                        # undirected adjacency is symmetric, so one lookup
+                        # yields every label between u_g and w_g
+                        for elab in self.G.edge_labels(u_g, w_g):
+                            a, b = (min(u_p, w_p), max(u_p, w_p))
+                            if (a, b, elab) in existing:
+                                continue
+                            if allowed_edge_types is not None:
+                                lu, lv = p.vlabels[u_p], p.vlabels[w_p]
+                                a, b = (lu, lv) if lu <= lv else (lv, lu)
+                                if (a, b, elab, 0) not in allowed_edge_types:
                                     continue
-                                if allowed_edge_types is not None:
-                                    lu, lv = p.vlabels[u_p], p.vlabels[w_p]
-                                    a, b = (lu, lv) if lu <= lv else (lv, lu)
-                                    if (a, b, elab, 0) not in allowed_edge_types:
-                                        continue
-                                q = Pattern(list(p.vlabels), list(p.edges) + [Edge(u_p, w_p, elab)], False)
-                                if q.key not in produced:
-                                    produced.add(q.key)
-                                    yield q
+                            add(Edge(u_p, w_p, elab), None)
                     else:
-                        if self.G.has_edge(u_g, w_g, None):
-                            labs = [lab for (v2, lab) in self.G.adj[u_g] if v2 == w_g]
-                            for elab in labs:
-                                if (u_p, w_p, elab) in existing:
+                        for elab in self.G.edge_labels(u_g, w_g):
+                            if (u_p, w_p, elab) in existing:
+                                continue
+                            if allowed_edge_types is not None:
+                                lu, lv = p.vlabels[u_p], p.vlabels[w_p]
+                                if (lu, lv, elab, 1) not in allowed_edge_types:
                                     continue
-                                if allowed_edge_types is not None:
-                                    lu, lv = p.vlabels[u_p], p.vlabels[w_p]
-                                    if (lu, lv, elab, 1) not in allowed_edge_types:
-                                        continue
-                                q = Pattern(list(p.vlabels), list(p.edges) + [Edge(u_p, w_p, elab)], True)
-                                if q.key not in produced:
-                                    produced.add(q.key)
-                                    yield q
-                        if self.G.has_edge(w_g, u_g, None):
-                            labs = [lab for (v2, lab) in self.G.adj[w_g] if v2 == u_g]
-                            for elab in labs:
-                                if (w_p, u_p, elab) in existing:
+                            add(Edge(u_p, w_p, elab), None)
+                        for elab in self.G.edge_labels(w_g, u_g):
+                            if (w_p, u_p, elab) in existing:
+                                continue
+                            if allowed_edge_types is not None:
+                                lu, lv = p.vlabels[w_p], p.vlabels[u_p]
+                                if (lu, lv, elab, 1) not in allowed_edge_types:
                                     continue
-                                if allowed_edge_types is not None:
-                                    lu, lv = p.vlabels[w_p], p.vlabels[u_p]
-                                    if (lu, lv, elab, 1) not in allowed_edge_types:
-                                        continue
-                                q = Pattern(list(p.vlabels), list(p.edges) + [Edge(w_p, u_p, elab)], True)
-                                if q.key not in produced:
-                                    produced.add(q.key)
-                                    yield q
+                            add(Edge(w_p, u_p, elab), None)
 
             grow_verts = ([rm] + ancestors) if heur else rmpath
             for u_p in grow_verts:
@@ -165,9 +203,9 @@ class CandidateGenerator:
                     continue
                 out_neigh = heur.neighbor_order(u_g) if heur else self.G.adj[u_g]
                 for v_g, elab in out_neigh:
-                    if v_g in emb.values():
+                    if v_g in used_vals:
                         continue
-                    if heur and not heur.degree_prune(pat_deg(u_p) + 1, len(self.G.adj[v_g])):
+                    if heur and not heur.degree_prune(deg_p[u_p] + 1, self.G.degree(v_g)):
                         continue
                     lv = self.G.vlabels[v_g]
                     new_vid = p.num_nodes()
@@ -180,21 +218,18 @@ class CandidateGenerator:
                             a, b = (lu, lv2) if lu <= lv2 else (lv2, lu)
                             if (a, b, elab, 0) not in allowed_edge_types:
                                 continue
-                    q = Pattern(list(p.vlabels) + [lv], list(p.edges) + [Edge(u_p, new_vid, elab)], p.directed)
-                    if q.key not in produced:
-                        produced.add(q.key)
-                        yield q
+                    add(Edge(u_p, new_vid, elab), lv)
 
                 if self.G.directed:
                     in_neigh = self.G.rev[u_g]
                     if heur:
                         in_neigh = sorted(in_neigh, key=lambda t: (
-                            heur.label_rarity(self.G.vlabels[t[0]]), -len(self.G.adj[t[0]])
+                            heur.label_rarity(self.G.vlabels[t[0]]), -self.G.degree(t[0])
                         ))
                     for v_g, elab in in_neigh:
-                        if v_g in emb.values():
+                        if v_g in used_vals:
                             continue
-                        if heur and not heur.degree_prune(pat_deg(u_p) + 1, len(self.G.adj[v_g])):
+                        if heur and not heur.degree_prune(deg_p[u_p] + 1, self.G.degree(v_g)):
                             continue
                         lv = self.G.vlabels[v_g]
                         new_vid = p.num_nodes()
@@ -202,7 +237,42 @@ class CandidateGenerator:
                             lu2 = lv; lv_p = p.vlabels[u_p]
                             if (lu2, lv_p, elab, 1) not in allowed_edge_types:
                                 continue
-                        q = Pattern(list(p.vlabels) + [lv], list(p.edges) + [Edge(new_vid, u_p, elab)], True)
-                        if q.key not in produced:
-                            produced.add(q.key)
-                            yield q
+                        add(Edge(new_vid, u_p, elab), lv)
+
+        # Phase 2 materializes the surviving descriptors from the parent's
+        # edge columns and dedups them by canonical key.
+        produced: Set[Tuple] = set()
+        for edge, lv in pending:
+            q = p.child(edge, lv)
+            if q.key not in produced:
+                produced.add(q.key)
+                yield q
+
+
+_EXTEND_STATE: Optional[Tuple[CandidateGenerator, Optional["SoGraMiHeuristics"]]] = None
+
+
+def _init_extend_worker(candgen: CandidateGenerator, heur: Optional["SoGraMiHeuristics"]):
+    """Install the worker-side generator and heuristics used by `_extend_chunk`.
+
+    Called from the miner's pool initializer with objects built on the
+    worker's own view of the graph, so tasks never carry the graph.
+    """
+    global _EXTEND_STATE
+    _EXTEND_STATE = (candgen, heur)
+
+
+def _extend_chunk(
+    p: Pattern,
+    embeddings: List[Dict[int, int]],
+    allowed_edge_types: Optional[AbstractSet[Tuple[str, str, Optional[str], int]]],
+    use_heur: bool,
+) -> List[Pattern]:
+    """Worker function computing the extensions of one embedding chunk."""
+    if _EXTEND_STATE is None:
+        raise RuntimeError("extension worker not initialized; pass a miner worker pool "
+                           "whose initializer calls _init_extend_worker")
+    candgen, heur = _EXTEND_STATE
+    if use_heur and heur is None:
+        raise RuntimeError("extension worker was initialized without heuristics")
+    return list(candgen._extend(p, embeddings, heur if use_heur else None, allowed_edge_types))
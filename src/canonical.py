@@ -5,8 +5,7 @@ and to produce a stable key for deduplication.
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Set, Dict
-from graph import Edge
+from typing import Iterable, List, Sequence, Tuple, Optional, Set, Dict
 
 
 class _CanonDFSHelper:
@@ -17,22 +16,24 @@ class _CanonDFSHelper:
     smallest sequence across seeds is returned as the canonical code.
     """
 
-    def __init__(self, directed: bool, vlabels: List[str], edges: List[Edge]):
+    def __init__(self, directed: bool, vlabels: Sequence[str],
+                 edges: Iterable[Tuple[int, int, Optional[str]]]):
+        """`edges` may be `Edge` objects or plain `(u, v, label)` tuples."""
         self.directed = directed
         self.vlabels = vlabels
         self.n = len(vlabels)
         self.p_adj: List[List[Tuple[int, Optional[str], int]]] = [[] for _ in range(self.n)]
         self.edge_keys: Set[Tuple[int, int, Optional[str], int]] = set()
-        for e in edges:
+        for u, v, label in edges:
             if directed:
-                self.p_adj[e.u].append((e.v, e.label, 1))
-                self.p_adj[e.v].append((e.u, e.label, 2))
-                self.edge_keys.add((e.u, e.v, e.label, 1))
+                self.p_adj[u].append((v, label, 1))
+                self.p_adj[v].append((u, label, 2))
+                self.edge_keys.add((u, v, label, 1))
             else:
-                self.p_adj[e.u].append((e.v, e.label, 0))
-                self.p_adj[e.v].append((e.u, e.label, 0))
-                a, b = (e.u, e.v) if e.u <= e.v else (e.v, e.u)
-                self.edge_keys.add((a, b, e.label, 0))
+                self.p_adj[u].append((v, label, 0))
+                self.p_adj[v].append((u, label, 0))
+                a, b = (u, v) if u <= v else (v, u)
+                self.edge_keys.add((a, b, label, 0))
 
     def canonical_code(self) -> Tuple[Tuple, ...]:
         """Compute and return the canonical DFS code as a tuple of tuples.
@@ -49,61 +50,103 @@ class _CanonDFSHelper:
             for (u, v, el, d) in sorted(self.edge_keys):
                 seeds.append((u, v, el, 0))
 
+        # every code starts with (0, 1, label(u), elabel, label(v), flag) of
+        # its seed, so only seeds with the smallest such prefix can win
+        vlabels = self.vlabels
+        if seeds:
+            min_prefix = min((vlabels[u], el or "", vlabels[v], df) for u, v, el, df in seeds)
+            seeds = [s for s in seeds if (vlabels[s[0]], s[2] or "", vlabels[s[1]], s[3]) == min_prefix]
+
+        return self._best_code(seeds) or tuple()
+
+    def _best_code(self, seeds: List[Tuple[int, int, Optional[str], int]]) -> Optional[Tuple[Tuple, ...]]:
+        """Return the smallest code grown from `seeds` (None if no seeds)."""
         best: Optional[Tuple[Tuple, ...]] = None
         for su, sv, el, df in seeds:
-            seq = self._dfs_enumerate(su, sv, el, df)
+            seq = self._dfs_enumerate(su, sv, el, df, best)
+            if seq is None:
+                continue
             t = tuple(seq)
             if best is None or t < best:
                 best = t
-        return best or tuple()
+        return best
 
-    def _dfs_enumerate(self, su: int, sv: int, elab: Optional[str], dflag: int) -> List[Tuple]:
-        visited_idx: Dict[int, int] = {}
-
-        def assign(u: int) -> int:
-            if u in visited_idx:
-                return visited_idx[u]
-            visited_idx[u] = len(visited_idx)
-            return visited_idx[u]
+    def _dfs_enumerate(self, su: int, sv: int, elab: Optional[str], dflag: int,
+                       bound: Optional[Tuple[Tuple, ...]] = None) -> Optional[List[Tuple]]:
+        """Return the DFS code grown from the given seed edge.
 
+        If `bound` (the best code so far) is given, enumeration stops and
+        returns None as soon as the partial code is known to compare
+        greater than `bound`; once it is known to be smaller the bound is
+        dropped.
+        """
+        directed = self.directed
+        p_adj = self.p_adj
+        vlabels = self.vlabels
+        edge_keys = self.edge_keys
+        visited_idx: Dict[int, int] = {}
         used_edges: Set[Tuple[int, int, Optional[str], int]] = set()
         code: List[Tuple] = []
-
-        def norm_key(u: int, v: int, el: Optional[str], df: int) -> Tuple[int, int, Optional[str], int]:
-            if self.directed:
-                return (u, v, el, 1)
-            a, b = (u, v) if u <= v else (v, u)
-            return (a, b, el, 0)
+        n_used = 0
+        n_edges = len(edge_keys)
 
         def push_edge(u: int, v: int, el: Optional[str], df: int):
-            uidx = assign(u); vidx = assign(v)
-            code.append((uidx, vidx, self.vlabels[u], el or "", self.vlabels[v], df))
-            used_edges.add(norm_key(u, v, el, df))
+            nonlocal n_used
+            uidx = visited_idx.get(u, -1)
+            if uidx < 0:
+                uidx = visited_idx[u] = len(visited_idx)
+            vidx = visited_idx.get(v, -1)
+            if vidx < 0:
+                vidx = visited_idx[v] = len(visited_idx)
+            code.append((uidx, vidx, vlabels[u], el or "", vlabels[v], df))
+            if directed:
+                key = (u, v, el, 1)
+            elif u <= v:
+                key = (u, v, el, 0)
+            else:
+                key = (v, u, el, 0)
+            if key not in used_edges:
+                used_edges.add(key)
+                # count only real pattern edges so `n_used` reaching
+                # `n_edges` means `used_edges` covers `edge_keys`
+                if key in edge_keys:
+                    n_used += 1
 
         push_edge(su, sv, elab, dflag)
 
         while True:
-            if used_edges >= self.edge_keys:
+            if bound is not None:
+                k = len(code) - 1
+                if k >= len(bound) or code[k] > bound[k]:
+                    return None
+                if code[k] < bound[k]:
+                    bound = None
+            if n_used == n_edges:
                 break
-            frontier: List[Tuple[int, int, Optional[str], int, int, int]] = []
+            # each entry is (sort key..., insertion counter, u, v, el, df);
+            # the counter keeps ties in scan order and stops the tuple
+            # comparison before it reaches the (possibly None) label
+            frontier: List[Tuple] = []
             for u, uidx in list(visited_idx.items()):
-                for v, el, df in self.p_adj[u]:
-                    key = norm_key(u, v, el, df)
+                lab_u = vlabels[u]
+                for v, el, df in p_adj[u]:
+                    if directed:
+                        key = (u, v, el, 1)
+                    elif u <= v:
+                        key = (u, v, el, 0)
+                    else:
+                        key = (v, u, el, 0)
                     if key in used_edges:
                         continue
-                    to_seen = (v in visited_idx)
-                    frontier.append((u, v, el, df, uidx, visited_idx.get(v, 10**9)))
+                    vidx = visited_idx.get(v, -1)
+                    if vidx >= 0:
+                        frontier.append((uidx, lab_u, el or "", 0, vlabels[v], df, vidx,
+                                         len(frontier), u, v, el, df))
+                    else:
+                        frontier.append((uidx, lab_u, el or "", 1, "~", df, -1,
+                                         len(frontier), u, v, el, df))
             if not frontier:
                 break
-            frontier.sort(key=lambda t: (
-                t[4],
-                self.vlabels[t[0]],
-                t[2] or "",
-                0 if t[5] != 10**9 else 1,
-                self.vlabels[t[1]] if t[5] != 10**9 else "~",
-                t[3],
-                t[5],
-            ))
-            u, v, el, df, _, _ = frontier[0]
+            _, _, _, _, _, _, _, _, u, v, el, df = min(frontier)
             push_edge(u, v, el, df)
         return code
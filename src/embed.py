@@ -1,7 +1,8 @@
 """Embedding enumeration and support computation.
 
 This module implements backtracking-based exact embedding enumeration
-and support computations used by the miners. It provides:
+and support computations used by the miners. Both enumeration entry
+points share a single iterative backtracking core (`_search`). It provides:
 - `full_support_count`: count (optionally capped) of full embeddings
 - `full_mni_embeddings`: enumerate all MNI embeddings (used as base)
 - `mni_support`: compute Minimum Image-based support from embeddings
@@ -9,8 +10,9 @@ and support computations used by the miners. It provides:
 
 from __future__ import annotations
 
-from typing import Dict, List, Set, Tuple, Optional
-from collections import defaultdict
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Dict, Iterator, List, Sequence, Set, Tuple, Optional
 from pattern import Pattern
 from graph import DataGraph
 
@@ -25,6 +27,8 @@ class EmbeddingEnumerator:
 
     def __init__(self, G: DataGraph):
         self.G = G
+        # pick the direction-specific edge-constraint layout once per graph
+        self._order_checks = self._order_checks_directed if G.directed else self._order_checks_undirected
 
     def full_support_count(self, p: Pattern, cap: Optional[int] = None) -> int:
         """Return number of full (injective) embeddings of `p` in `G`.
@@ -32,49 +36,15 @@ class EmbeddingEnumerator:
         If `cap` is provided the search stops early once the count reaches
         the cap value (used for early-pruning scenarios).
         """
+        if cap is not None and cap <= 0:
+            return 0
         domains = self._initial_domains(p)
         order = self._assignment_order(p, domains)
-        assignment: Dict[int, int] = {}
         count = 0
-        nbrs: Dict[int, List[Tuple[int, Optional[str], int]]] = defaultdict(list)
-        for e in p.edges:
-            nbrs[e.u].append((e.v, e.label, 1))
-            if not p.directed:
-                nbrs[e.v].append((e.u, e.label, 1))
-            else:
-                nbrs[e.v].append((e.u, e.label, 2))
-
-        def consistent(u_p: int, u_g: int) -> bool:
-            if p.vlabels[u_p] != self.G.vlabels[u_g]:
-                return False
-            for v_p, elab, d in nbrs[u_p]:
-                if v_p in assignment:
-                    v_g = assignment[v_p]
-                    if d == 1:
-                        if not self.G.has_edge(u_g, v_g, elab):
-                            return False
-                    else:
-                        if not self.G.has_edge(v_g, u_g, elab):
-                            return False
-            return True
-
-        def backtrack(i: int):
-            nonlocal count
+        for _ in self._search(p, domains, order):
+            count += 1
             if cap is not None and count >= cap:
-                return
-            if i == len(order):
-                count += 1
-                return
-            u_p = order[i]
-            for u_g in domains[u_p]:
-                if u_g in assignment.values():
-                    continue
-                if consistent(u_p, u_g):
-                    assignment[u_p] = u_g
-                    backtrack(i + 1)
-                    del assignment[u_p]
-
-        backtrack(0)
+                break
         return count
 
     def full_mni_embeddings(self, p: Pattern) -> List[Dict[int, int]]:
@@ -84,45 +54,143 @@ class EmbeddingEnumerator:
         """
         domains = self._initial_domains(p)
         order = self._assignment_order(p, domains)
-        assignment: Dict[int, int] = {}
-        solutions: List[Dict[int, int]] = []
-        nbrs: Dict[int, List[Tuple[int, Optional[str], int]]] = defaultdict(list)
-        for e in p.edges:
-            nbrs[e.u].append((e.v, e.label, 1))
-            if not p.directed:
-                nbrs[e.v].append((e.u, e.label, 1))
-            else:
-                nbrs[e.v].append((e.u, e.label, 2))
-
-        def consistent(u_p: int, u_g: int) -> bool:
-            if p.vlabels[u_p] != self.G.vlabels[u_g]:
-                return False
-            for v_p, elab, d in nbrs[u_p]:
-                if v_p in assignment:
-                    v_g = assignment[v_p]
-                    if d == 1:
-                        if not self.G.has_edge(u_g, v_g, elab):
-                            return False
-                    elif d == 2:
-                        if not self.G.has_edge(v_g, u_g, elab):
-                            return False
-            return True
-
-        def backtrack(i: int):
-            if i == len(order):
-                solutions.append(dict(assignment))
+        return [dict(zip(order, assigned)) for assigned in self._search(p, domains, order)]
+
+    def _search(self, p: Pattern, domains: Dict[int, Sequence[int]], order: List[int]) -> Iterator[List[int]]:
+        """Backtracking core shared by the counting and enumeration paths.
+
+        Pattern vertices are matched in `order`; every pattern edge is
+        checked once, at the position of whichever endpoint comes later.
+        The search uses an explicit stack of domain iterators instead of
+        recursion and yields the (reused) list of graph nodes assigned to
+        each position of `order`; callers must copy it if they keep it.
+        """
+        k = len(order)
+        if k == 0:
+            yield []
+            return
+        G = self.G
+        vlab_id = G.vlab_id
+        lids = [G._vlab_vocab.get(p.vlabels[u], -1) for u in order]
+        elab_vocab = G._elab_vocab
+        # csr[True] holds the rows of in-neighbors; both alias for undirected graphs
+        csr = {False: (G.adj_indptr, G.adj_idx, G.adj_elab),
+               True: (G.rev_indptr, G.rev_idx, G.rev_elab)}
+        assigned: List[int] = [-1] * k
+        # used[u_g] is set while graph node u_g is part of the assignment
+        used = bytearray(len(G.vlabels))
+
+        # constraints[i] lists (j, edge label id, reverse): the node matched
+        # at position i must appear in the CSR row of the node at the
+        # earlier position j (its in-neighbor row when `reverse`), with that
+        # label (None matches any label, -1 never matches).
+        constraints: List[List[Tuple[int, Optional[int], bool]]] = [[] for _ in order]
+
+        def add(i: int, j: int, elab: Optional[str], reverse: bool):
+            constraints[i].append((j, None if elab is None else elab_vocab.get(elab, -1), reverse))
+
+        if G.directed:
+            outs, ins = self._order_checks(p, order)
+            for i in range(k):
+                for j, elab in outs[i]:
+                    add(i, j, elab, True)
+                for j, elab in ins[i]:
+                    add(i, j, elab, False)
+        else:
+            for i, checks in enumerate(self._order_checks(p, order)):
+                for j, elab in checks:
+                    add(i, j, elab, False)
+
+        def candidates(i: int) -> Iterator[int]:
+            # Positions without matched neighbors scan the label domain.
+            # Otherwise walk the shortest CSR row among the matched
+            # neighbors and binary-search the others; rows are sorted, so
+            # candidates come out in ascending order as from the domain.
+            if not constraints[i]:
+                yield from domains[order[i]]
                 return
-            u_p = order[i]
-            for u_g in sorted(domains[u_p]):
-                if u_g in assignment.values():
+            rows = []
+            for j, want, reverse in constraints[i]:
+                indptr, idx, elab = csr[reverse]
+                a = assigned[j]
+                rows.append((indptr[a + 1] - indptr[a], indptr[a], idx, elab, want))
+            rows.sort(key=itemgetter(0))
+            _, lo, idx, elab, want = rows[0]
+            hi = lo + rows[0][0]
+            rest = rows[1:]
+            lid = lids[i]
+            prev = -1
+            for pos in range(lo, hi):
+                v = idx[pos]
+                if v == prev or vlab_id[v] != lid or (want is not None and elab[pos] != want):
                     continue
-                if consistent(u_p, u_g):
-                    assignment[u_p] = u_g
-                    backtrack(i + 1)
-                    del assignment[u_p]
+                for n2, lo2, idx2, elab2, want2 in rest:
+                    hi2 = lo2 + n2
+                    q = bisect_left(idx2, v, lo2, hi2)
+                    while q < hi2 and idx2[q] == v:
+                        if want2 is None or elab2[q] == want2:
+                            break
+                        q += 1
+                    else:
+                        break
+                else:
+                    prev = v
+                    yield v
+
+        stack = [candidates(0)]
+        while stack:
+            i = len(stack) - 1
+            if assigned[i] >= 0:
+                used[assigned[i]] = 0
+            for u_g in stack[i]:
+                if not used[u_g]:
+                    assigned[i] = u_g
+                    used[u_g] = 1
+                    break
+            else:
+                assigned[i] = -1
+                stack.pop()
+                continue
+            if i + 1 == k:
+                yield assigned
+            else:
+                stack.append(candidates(i + 1))
 
-        backtrack(0)
-        return solutions
+    def _order_checks_undirected(self, p: Pattern, order: List[int]) -> List[List[Tuple[int, Optional[str]]]]:
+        """Attach each pattern edge to the later of its endpoints in `order`.
+
+        Entry `i` lists `(j, label)` pairs: the node matched at position
+        `i` must be adjacent to the one at the earlier position `j`.
+        """
+        pos = {u: i for i, u in enumerate(order)}
+        checks: List[List[Tuple[int, Optional[str]]]] = [[] for _ in order]
+        for u, v, label in p.iter_edges():
+            i, j = pos[u], pos[v]
+            if i > j:
+                checks[i].append((j, label))
+            elif j > i:
+                checks[j].append((i, label))
+        return checks
+
+    def _order_checks_directed(
+        self, p: Pattern, order: List[int]
+    ) -> Tuple[List[List[Tuple[int, Optional[str]]]], List[List[Tuple[int, Optional[str]]]]]:
+        """Directed variant of `_order_checks_undirected`.
+
+        Returns `(outs, ins)`: `outs[i]` lists `(j, label)` pairs needing an
+        edge from the node at position `i` to the one at `j`, `ins[i]` an
+        edge from `j` to `i`.
+        """
+        pos = {u: i for i, u in enumerate(order)}
+        outs: List[List[Tuple[int, Optional[str]]]] = [[] for _ in order]
+        ins: List[List[Tuple[int, Optional[str]]]] = [[] for _ in order]
+        for u, v, label in p.iter_edges():
+            i, j = pos[u], pos[v]
+            if i > j:
+                outs[i].append((j, label))
+            elif j > i:
+                (ins if p.directed else outs)[j].append((i, label))
+        return outs, ins
 
     def mni_support(self, embeddings: List[Dict[int,int]], k: int) -> int:
         """Compute MNI (minimum image-based) support from embeddings.
@@ -139,13 +207,21 @@ class EmbeddingEnumerator:
                 imgs[pnode].add(gnode)
         return min(len(s) for s in imgs)
 
-    def _initial_domains(self, p: Pattern) -> Dict[int, Set[int]]:
-        return {i: set(self.G.lab2nodes.get(lbl, set())) for i, lbl in enumerate(p.vlabels)}
+    def _initial_domains(self, p: Pattern) -> Dict[int, Sequence[int]]:
+        """Map each pattern vertex to the graph nodes sharing its label.
 
-    def _assignment_order(self, p: Pattern, domains: Dict[int, Set[int]]) -> List[int]:
+        The domains are the graph's own pre-sorted per-label arrays; the
+        search iterates them directly and must not modify them.
+        """
+        return {i: self.G.label_nodes(lbl) for i, lbl in enumerate(p.vlabels)}
+
+    def _assignment_order(self, p: Pattern, domains: Dict[int, Sequence[int]]) -> List[int]:
         from collections import defaultdict
         deg = defaultdict(int)
-        for e in p.edges:
-            deg[e.u] += 1; deg[e.v] += 1
+        for u in p.edges_u:
+            deg[u] += 1
+        for v in p.edges_v:
+            deg[v] += 1
         # order by (smallest domain, highest pattern degree, stable id)
         return sorted(range(p.num_nodes()), key=lambda u: (len(domains[u]), -deg[u], u))
+
@@ -1,22 +1,27 @@
 """Lightweight graph model used by the mining algorithms.
 
 This module defines two simple primitives:
-- `Edge`: immutable dataclass representing a labeled (u,v) edge.
+- `Edge`: immutable named tuple representing a labeled (u,v) edge.
 - `DataGraph`: adjacency-based graph container with helpers used by
-  the pattern miners and embedding enumerator.
+  the pattern miners and embedding enumerator. Besides the list-based
+  adjacency it keeps a flat CSR copy in `array.array` buffers.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple, Optional
+from array import array
+import gc
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence, Set, Tuple, Optional
 from collections import defaultdict
 
 
-@dataclass(frozen=True)
-class Edge:
+class Edge(NamedTuple):
     """Immutable edge record.
 
+    A `NamedTuple` keeps instances as small as plain tuples (no per-instance
+    `__dict__`), which matters since patterns are copied edge by edge.
+
     Attributes:
     - u, v: integer node ids
     - label: optional edge label (can be None)
@@ -33,7 +38,8 @@ class DataGraph:
     (`rev`) lists. For undirected graphs both structures contain the same
     neighbor entries (i.e., edges are stored in both directions).
     `lab2nodes` maps vertex label -> set(node ids) for quick domain
-    computation during embedding enumeration.
+    computation during embedding enumeration; `vlab_id`/`lab2nodes_id`
+    hold the same information keyed by small integer label ids.
     """
 
     @classmethod
@@ -44,26 +50,88 @@ class DataGraph:
         - `v <id> [label]` defines a vertex (label optional)
         - `e <u> <v> [elabel]` defines an edge (label optional)
         """
-        vlabels: Dict[int, str] = {}
-        edges: List[Edge] = []
         with open(path, 'r') as f:
-            for line in f:
-                parts = line.strip().split()
+            data = f.read()
+        # Loading allocates millions of small, acyclic containers; pausing
+        # the cyclic GC avoids repeated full scans of the growing heap.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            vlabels: Dict[int, str] = {}
+            edges: List[Edge] = []
+            append = edges.append
+            for parts in map(str.split, data.splitlines()):
                 if not parts:
                     continue
-                tag = parts[0].lower()
-                if tag == 'v':
-                    idx = int(parts[1])
-                    lab = parts[2] if len(parts) > 2 else ""
-                    vlabels[idx] = lab
-                elif tag == 'e':
-                    u = int(parts[1])
-                    v = int(parts[2])
-                    elab = parts[3] if len(parts) > 3 else None
-                    edges.append(Edge(u, v, elab))
-        max_idx = max(vlabels) if vlabels else -1
-        labels_list = [vlabels.get(i, "") for i in range(max_idx + 1)]
-        return cls(directed, labels_list, edges)
+                tag = parts[0]
+                # edges dominate typical files, so test for them first
+                if tag == 'e' or tag == 'E':
+                    append(Edge(int(parts[1]), int(parts[2]), parts[3] if len(parts) > 3 else None))
+                elif tag == 'v' or tag == 'V':
+                    vlabels[int(parts[1])] = parts[2] if len(parts) > 2 else ""
+            del data
+            max_idx = max(vlabels) if vlabels else -1
+            labels_list = [vlabels.get(i, "") for i in range(max_idx + 1)]
+            return cls(directed, labels_list, edges)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    @classmethod
+    def from_csr(cls, directed: bool, vlab_id: Sequence[int], vlab_names: List[str],
+                 adj_indptr: Sequence[int], adj_idx: Sequence[int], adj_elab: Sequence[int],
+                 adj_slot: Sequence[int], elab_names: List[Optional[str]],
+                 rev_indptr: Optional[Sequence[int]] = None,
+                 rev_idx: Optional[Sequence[int]] = None,
+                 rev_elab: Optional[Sequence[int]] = None,
+                 rev_slot: Optional[Sequence[int]] = None,
+                 lab_indptr: Optional[Sequence[int]] = None,
+                 lab_nodes: Optional[Sequence[int]] = None) -> "DataGraph":
+        """Build a read-only graph directly on top of existing CSR buffers.
+
+        The buffers (e.g. `memoryview`s over shared memory) are used as is,
+        not copied. `adj`/`rev` become views that decode the CSR slices on
+        access and the `adj_set`/`rev_set` lookups are replaced by binary
+        searches. The `rev_*` buffers are only needed for directed graphs.
+        `lab_indptr`/`lab_nodes` optionally give `lab2nodes_id` in the same
+        CSR layout (label id -> sorted nodes); otherwise it is rebuilt
+        from `vlab_id`. The set-based `lab2nodes` is only built on first
+        access.
+        """
+        G = cls.__new__(cls)
+        G.directed = directed
+        G.vlabels = [vlab_names[lid] for lid in vlab_id]
+        G._vlab_vocab = {lab: lid for lid, lab in enumerate(vlab_names)}
+        G._vlab_names = list(vlab_names)
+        G.vlab_id = vlab_id
+        if lab_indptr is not None:
+            G.lab2nodes_id = [lab_nodes[lab_indptr[lid]:lab_indptr[lid + 1]]
+                              for lid in range(len(vlab_names))]
+        else:
+            G.lab2nodes_id = [array('i') for _ in vlab_names]
+            for i, lid in enumerate(vlab_id):
+                G.lab2nodes_id[lid].append(i)
+        G._elab_names = list(elab_names)
+        G._elab_vocab = {lab: lid for lid, lab in enumerate(elab_names)}
+        G._has_elabels = any(lab is not None for lab in elab_names)
+        G.adj_indptr, G.adj_idx, G.adj_elab, G.adj_slot = adj_indptr, adj_idx, adj_elab, adj_slot
+        if directed:
+            G.rev_indptr, G.rev_idx, G.rev_elab, G.rev_slot = rev_indptr, rev_idx, rev_elab, rev_slot
+        else:
+            G.rev_indptr, G.rev_idx, G.rev_elab, G.rev_slot = adj_indptr, adj_idx, adj_elab, adj_slot
+        G.adj = _CSRAdjacency(G.adj_indptr, G.adj_idx, G.adj_elab, G.adj_slot, G._elab_names)
+        G.rev = _CSRAdjacency(G.rev_indptr, G.rev_idx, G.rev_elab, G.rev_slot, G._elab_names)
+        G.adj_set = None
+        G.rev_set = None
+        return G
+
+    def __getattr__(self, name: str):
+        # graphs built by `from_csr` derive `lab2nodes` only if something
+        # asks for it; the miners read `lab2nodes_id` / `label_nodes`
+        if name == 'lab2nodes':
+            self.lab2nodes = defaultdict(set, zip(self._vlab_names, map(set, self.lab2nodes_id)))
+            return self.lab2nodes
+        raise AttributeError(name)
 
     def __init__(self, directed: bool, vlabels: List[str], edges: List[Edge]):
         self.directed = directed
@@ -73,7 +141,8 @@ class DataGraph:
         self.adj: List[List[Tuple[int, Optional[str]]]] = [[] for _ in range(n)]
         # reverse adjacency: useful for directed graphs
         self.rev: List[List[Tuple[int, Optional[str]]]] = [[] for _ in range(n)]
-        # adjacency sets indexed by neighbor -> set(labels) for quick checks
+        # adjacency sets indexed by neighbor -> set(labels) for quick checks;
+        # compacted once filled, see `_freeze_adjacency_sets`
         self.adj_set: List[Dict[int, Set[Optional[str]]]] = [defaultdict(set) for _ in range(n)]
         self.rev_set: List[Dict[int, Set[Optional[str]]]] = [defaultdict(set) for _ in range(n)]
         for e in edges:
@@ -87,10 +156,97 @@ class DataGraph:
                 self.adj_set[e.v][e.u].add(e.label)
                 self.rev[e.u].append((e.v, e.label))
                 self.rev_set[e.u][e.v].add(e.label)
+        self._freeze_adjacency_sets()
         # map label -> set of nodes with that label
         self.lab2nodes: Dict[str, Set[int]] = defaultdict(set)
         for i, lab in enumerate(vlabels):
             self.lab2nodes[lab].add(i)
+        # integer-encoded vertex labels: `vlab_id[u]` indexes `_vlab_names`
+        # and `lab2nodes_id[lid]` holds the sorted nodes carrying label `lid`
+        self._vlab_vocab: Dict[str, int] = {}
+        self._vlab_names: List[str] = []
+        self.vlab_id = array('i')
+        self.lab2nodes_id: List[array] = []
+        for i, lab in enumerate(vlabels):
+            lid = self._vlab_vocab.get(lab)
+            if lid is None:
+                lid = self._vlab_vocab[lab] = len(self._vlab_names)
+                self._vlab_names.append(lab)
+                self.lab2nodes_id.append(array('i'))
+            self.vlab_id.append(lid)
+            self.lab2nodes_id[lid].append(i)
+        self._build_csr()
+
+    def _freeze_adjacency_sets(self):
+        """Compact `adj_set`/`rev_set` once construction is finished.
+
+        The per-neighbor label sets become frozensets in plain dicts. When
+        no edge carries a label, each entry is instead reduced to a plain
+        set of neighbor ids and `_has_elabels` is False; use `has_edge` or
+        `edge_labels` rather than indexing `adj_set` directly.
+        """
+        self._has_elabels = any(
+            labs != {None} for d in self.adj_set for labs in d.values()
+        )
+        if self._has_elabels:
+            self.adj_set = [{v: frozenset(labs) for v, labs in d.items()} for d in self.adj_set]
+            self.rev_set = [{v: frozenset(labs) for v, labs in d.items()} for d in self.rev_set]
+        else:
+            self.adj_set = [set(d) for d in self.adj_set]
+            self.rev_set = [set(d) for d in self.rev_set]
+
+    def _build_csr(self):
+        """Flatten `adj`/`rev` into CSR arrays of 32-bit ints.
+
+        The neighbors of `u` are `adj_idx[adj_indptr[u]:adj_indptr[u + 1]]`,
+        sorted by node id, with edge label ids at the same positions of
+        `adj_elab`; ids map to labels through `_elab_vocab` (and back
+        through `_elab_names`). `adj_slot` records the position each entry
+        had in `adj[u]`, so views over the CSR arrays can reproduce the
+        list order (see `_CSRAdjacency`). For undirected graphs the `rev_*`
+        arrays alias the `adj_*` ones.
+        """
+        self._elab_vocab: Dict[Optional[str], int] = {}
+        self._elab_names: List[Optional[str]] = []
+
+        def flatten(lists: List[List[Tuple[int, Optional[str]]]]) -> Tuple[array, array, array, array]:
+            indptr, idx, elab, slots = array('i', [0]), array('i'), array('i'), array('i')
+            vocab = self._elab_vocab
+            for nbrs in lists:
+                for slot, (v, lab) in sorted(enumerate(nbrs), key=_entry_node):
+                    lid = vocab.get(lab)
+                    if lid is None:
+                        lid = vocab[lab] = len(self._elab_names)
+                        self._elab_names.append(lab)
+                    idx.append(v)
+                    elab.append(lid)
+                    slots.append(slot)
+                indptr.append(len(idx))
+            return indptr, idx, elab, slots
+
+        self.adj_indptr, self.adj_idx, self.adj_elab, self.adj_slot = flatten(self.adj)
+        if self.directed:
+            self.rev_indptr, self.rev_idx, self.rev_elab, self.rev_slot = flatten(self.rev)
+        else:
+            self.rev_indptr, self.rev_idx, self.rev_elab = self.adj_indptr, self.adj_idx, self.adj_elab
+            self.rev_slot = self.adj_slot
+
+    def degree(self, u: int) -> int:
+        """Return the number of (forward) adjacency entries of `u`."""
+        return self.adj_indptr[u + 1] - self.adj_indptr[u]
+
+    def has_edge_csr(self, u: int, v: int, label: Optional[str] = None) -> bool:
+        """Same as `has_edge` but answered by binary search on the CSR arrays."""
+        lo, hi = self.adj_indptr[u], self.adj_indptr[u + 1]
+        i = bisect_left(self.adj_idx, v, lo, hi)
+        if label is None:
+            return i < hi and self.adj_idx[i] == v
+        lid = self._elab_vocab.get(label)
+        while i < hi and self.adj_idx[i] == v:
+            if self.adj_elab[i] == lid:
+                return True
+            i += 1
+        return False
 
     def edge_type_counts(self) -> Dict[Tuple[str, str, Optional[str], int], int]:
         """Count occurrences of each (label,label,edge_label,directed_flag) type.
@@ -121,7 +277,65 @@ class DataGraph:
         """Return True if an edge (u->v) exists; if `label` is provided it
         must match the edge label.
         """
-        for w, lab in self.adj[u]:
-            if w == v and (label is None or lab == label):
-                return True
-        return False
+        if self.adj_set is None:
+            return self.has_edge_csr(u, v, label)
+        if not self._has_elabels:
+            return label is None and v in self.adj_set[u]
+        labs = self.adj_set[u].get(v)
+        return labs is not None and (label is None or label in labs)
+
+    def edge_labels(self, u: int, v: int) -> Iterable[Optional[str]]:
+        """Return the distinct labels of the edges (u->v) (empty if none)."""
+        if self.adj_set is None:
+            lo, hi = self.adj_indptr[u], self.adj_indptr[u + 1]
+            i = bisect_left(self.adj_idx, v, lo, hi)
+            labs: List[Optional[str]] = []
+            while i < hi and self.adj_idx[i] == v:
+                labs.append(self._elab_names[self.adj_elab[i]])
+                i += 1
+            return frozenset(labs)
+        if not self._has_elabels:
+            return (None,) if v in self.adj_set[u] else ()
+        return self.adj_set[u].get(v, ())
+
+    def label_nodes(self, label: str) -> Sequence[int]:
+        """Return the sorted ids of the nodes carrying vertex label `label`."""
+        lid = self._vlab_vocab.get(label)
+        return self.lab2nodes_id[lid] if lid is not None else ()
+
+
+def _entry_node(entry: Tuple[int, Tuple[int, Optional[str]]]) -> int:
+    """Sort key of an `(slot, (neighbor, label))` adjacency entry."""
+    return entry[1][0]
+
+
+class _CSRAdjacency:
+    """Read-only `adj`-style view over CSR buffers (see `DataGraph.from_csr`).
+
+    `view[u]` returns the `(neighbor, label)` list of `u`, decoded from the
+    CSR slice on each access and put back in the original `adj[u]` order
+    through the slot array.
+    """
+
+    def __init__(self, indptr: Sequence[int], idx: Sequence[int], elab: Sequence[int],
+                 slot: Sequence[int], names: List[Optional[str]]):
+        self.indptr = indptr
+        self.idx = idx
+        self.elab = elab
+        self.slot = slot
+        self.names = names
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __getitem__(self, u: int) -> List[Tuple[int, Optional[str]]]:
+        lo, hi = self.indptr[u], self.indptr[u + 1]
+        names = self.names
+        out: List[Tuple[int, Optional[str]]] = [None] * (hi - lo)
+        for v, l, k in zip(self.idx[lo:hi], self.elab[lo:hi], self.slot[lo:hi]):
+            out[k] = (v, names[l])
+        return out
+
+    def __iter__(self) -> Iterator[List[Tuple[int, Optional[str]]]]:
+        for u in range(len(self)):
+            yield self[u]
@@ -12,15 +12,23 @@ via `ProcessPoolExecutor`.
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Optional, Set
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from array import array
+from typing import Deque, Dict, FrozenSet, Iterator, List, Tuple, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from itertools import compress
+from operator import itemgetter, sub
 import os
-from collections import defaultdict
 
 from graph import DataGraph, Edge
 from pattern import Pattern
 from embed import EmbeddingEnumerator
-from candidate import CandidateGenerator
+from candidate import CandidateGenerator, _init_extend_worker
+
+# below this many embeddings `materialize_all_embeddings` stays serial
+PARALLEL_MIN_MATERIALIZE = 2048
 
 
 class SuGraMiMiner:
@@ -35,10 +43,13 @@ class SuGraMiMiner:
         self.G = G
         self.min_support = min_support
         self.embedder = EmbeddingEnumerator(G)
-        self.candgen = CandidateGenerator(G)
+        self.candgen = CandidateGenerator(G, max_workers)
         self.max_workers = max_workers
+        # neighbor-ordering heuristics passed to extensions (SoPaGraMi only)
+        self.heur: Optional[SoGraMiHeuristics] = None
 
-    def mine(self, parallel: bool = True, max_size: Optional[int] = None) -> Dict[Tuple, Dict]:
+    def mine(self, parallel: bool = True, max_size: Optional[int] = None,
+             prune_covered: bool = False) -> Dict[Tuple, Dict]:
         """Run the mining process and return discovered frequent patterns.
 
         Returned value is a mapping from pattern `key` -> dict with keys:
@@ -46,66 +57,236 @@ class SuGraMiMiner:
         - `support`: MNI support
         - `full_support`: raw number of injective embeddings
         - `embeddings`: list of embeddings used to compute support
+
+        With `prune_covered` a frequent pattern is not extended when its
+        embedding images are covered by an earlier pattern of the same
+        shape (see `_covered`). This is a heuristic: it can miss patterns
+        that the plain search would report, and is off by default.
         """
         results: Dict[Tuple, Dict] = {}
+        self._closed_ht: Dict[Tuple, List[FrozenSet[Tuple[int, ...]]]] = defaultdict(list)
         frontier: List[Pattern] = list(self.candgen.seed_patterns())
 
-        while frontier:
-            eval_results = self._evaluate_patterns(frontier, parallel)
-            next_frontier: List[Pattern] = []
-            for p, embeddings in eval_results:
-                supp = self.embedder.mni_support(embeddings, p.num_nodes())
-                if supp >= self.min_support:
-                    full_supp = self.embedder.full_support_count(p)
-                    results[p.key] = {'pattern': p, 'support': supp, 'full_support': full_supp, 'embeddings': embeddings}
-                    if max_size is None or p.num_nodes() < max_size:
-                        for q in self.candgen.extensions(p, embeddings):
-                            if q.key not in results:
-                                next_frontier.append(q)
-            seen: Set[Tuple] = set()
-            dedup: List[Pattern] = []
-            for q in next_frontier:
-                if q.key not in seen:
-                    seen.add(q.key)
-                    dedup.append(q)
-            frontier = dedup
+        with self._worker_pool(parallel) as pool:
+            while frontier:
+                next_frontier: Dict[Tuple, Pattern] = {}
+                for p, embeddings in self._evaluate_patterns(frontier, parallel, pool):
+                    n = p.num_nodes()
+                    supp = self.embedder.mni_support(embeddings, n)
+                    if supp >= self.min_support:
+                        # `embeddings` already lists every injective embedding, so
+                        # its length is the full support (`full_support_count`)
+                        results[p.key] = {'pattern': p, 'support': supp, 'full_support': len(embeddings), 'embeddings': embeddings}
+                        if prune_covered and self._covered(p, embeddings):
+                            continue
+                        if max_size is None or n < max_size:
+                            for q in self.candgen.extensions(p, embeddings, parallel=parallel, executor=pool):
+                                if q.key not in results and q.key not in next_frontier:
+                                    next_frontier[q.key] = q
+                frontier = list(next_frontier.values())
         return results
 
-    def _evaluate_patterns(self, patterns: List[Pattern], parallel: bool) -> List[Tuple[Pattern, List[Dict[int, int]]]]:
-        """Evaluate a batch of patterns and return their embeddings.
+    def _covered(self, p: Pattern, embeddings: List[Dict[int, int]]) -> bool:
+        """Return True if an earlier pattern's embeddings cover those of `p`.
+
+        Patterns are grouped by a signature (node count and sorted edge
+        labels); `p` is covered when its set of embedding images (the
+        sorted graph nodes of each embedding) is contained in the set of
+        an earlier pattern with the same signature. Otherwise the set is
+        recorded for later patterns.
+        """
+        sig = (p.num_nodes(), tuple(sorted(p.edges_label, key=lambda l: (l is not None, l or ""))))
+        images = frozenset(tuple(sorted(emb.values())) for emb in embeddings)
+        entries = self._closed_ht[sig]
+        for other in entries:
+            if images <= other:
+                return True
+        entries.append(images)
+        return False
+
+    @contextmanager
+    def _worker_pool(self, parallel: bool) -> Iterator[Optional[ProcessPoolExecutor]]:
+        """Run the process pool used by `mine` (yields None if serial).
+
+        The graph's CSR arrays are copied once into shared memory blocks
+        that every worker attaches to (see `_init_worker`), and the pool is
+        kept for the whole BFS, so tasks only carry the (small) pattern.
+        The blocks are released once the pool has shut down.
+        """
+        if not parallel or self.max_workers <= 1:
+            yield None
+            return
+        with _shared_graph_pool(self.G, self.max_workers, extend=True,
+                                heuristics=self.heur is not None) as ex:
+            yield ex
+
+    def _evaluate_patterns(self, patterns: List[Pattern], parallel: bool,
+                           executor: Optional[ProcessPoolExecutor] = None) -> Iterator[Tuple[Pattern, List[Dict[int, int]]]]:
+        """Evaluate a batch of patterns and yield `(pattern, embeddings)` pairs.
 
         If `parallel` is True a process pool is used to evaluate each pattern
         in parallel (useful for expensive embedding enumeration on large
-        graphs).
+        graphs). `executor` is the pool from `_worker_pool`; without one a
+        temporary pool is created for this batch. Results are yielded in
+        the order of `patterns`. At most `2 * max_workers` buckets are in
+        flight at once, so work the caller submits to the same pool while
+        consuming results (e.g. extension chunks) only waits behind that
+        window rather than behind the whole batch.
         """
         if not parallel or self.max_workers <= 1 or len(patterns) == 1:
-            return [(p, self.embedder.full_mni_embeddings(p)) for p in patterns]
-        out: List[Tuple[Pattern, List[Dict[int, int]]]] = []
-        payload = (self.G.directed, self.G.vlabels, self.G.adj, self.G.rev)
-        with ProcessPoolExecutor(max_workers=self.max_workers) as ex:
-            fut2p = {ex.submit(_worker_embeddings, payload, p.vlabels, p.edges): p for p in patterns}
-            for fut in as_completed(fut2p):
-                p = fut2p[fut]
-                embeddings = fut.result()
-                out.append((p, embeddings))
-        return out
+            for p in patterns:
+                yield p, self.embedder.full_mni_embeddings(p)
+            return
+        if executor is None:
+            with self._worker_pool(parallel) as ex:
+                yield from self._evaluate_patterns(patterns, parallel, ex)
+            return
+        # cheap patterns dominate wide frontiers, so each task carries a
+        # bucket of patterns rather than one; buckets are submitted with a
+        # bounded lookahead and their results handed back in order
+        size = max(1, len(patterns) // (4 * self.max_workers))
+        buckets = ([(i, p.vlabels, p.edges_u, p.edges_v, p.edges_label)
+                    for i, p in enumerate(patterns[j:j + size], j)]
+                   for j in range(0, len(patterns), size))
+        pending: Deque[Future] = deque()
+        try:
+            for bucket in buckets:
+                pending.append(executor.submit(_worker_embeddings_batch, bucket))
+                if len(pending) < 2 * self.max_workers:
+                    continue
+                for i, embeddings in pending.popleft().result():
+                    yield patterns[i], embeddings
+            while pending:
+                for i, embeddings in pending.popleft().result():
+                    yield patterns[i], embeddings
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+_WORKER_G: Optional[DataGraph] = None
+_WORKER_EMBEDDER: Optional[EmbeddingEnumerator] = None
+
+
+@contextmanager
+def _shared_graph_pool(G: DataGraph, max_workers: int, extend: bool = False,
+                       heuristics: bool = False) -> Iterator[ProcessPoolExecutor]:
+    """Run a process pool whose workers see `G` through shared memory.
+
+    Workers are set up by `_init_worker`; with `extend` they can also run
+    `CandidateGenerator.extensions` chunks, and with `heuristics` those
+    chunks may use `SoGraMiHeuristics`. The shared blocks are released
+    once the pool has shut down.
+    """
+    blocks, payload = _share_graph(G, extend, heuristics)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(payload,)) as ex:
+            yield ex
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+
+def _share_graph(G: DataGraph, extend: bool = False,
+                 heuristics: bool = False) -> Tuple[List[SharedMemory], Tuple]:
+    """Copy the CSR arrays of `G` into fresh shared memory blocks.
+
+    Returns the blocks (owned by the caller, who must close and unlink
+    them) and the picklable payload `_init_worker` attaches with. The
+    reverse arrays are only shared for directed graphs. The label index
+    `lab2nodes_id` travels flattened into the same CSR layout, so workers
+    need not rebuild it from `vlab_id`. `extend`/`heuristics` are passed
+    through to `_init_worker`.
+    """
+    names = ['vlab_id', 'adj_indptr', 'adj_idx', 'adj_elab', 'adj_slot']
+    if G.directed:
+        names += ['rev_indptr', 'rev_idx', 'rev_elab', 'rev_slot']
+    arrays = {name: getattr(G, name) for name in names}
+    lab_indptr, lab_nodes = array('i', [0]), array('i')
+    for nodes in G.lab2nodes_id:
+        lab_nodes.extend(nodes)
+        lab_indptr.append(len(lab_nodes))
+    arrays['lab_indptr'] = lab_indptr
+    arrays['lab_nodes'] = lab_nodes
+    blocks: List[SharedMemory] = []
+    specs: Dict[str, Tuple[str, str, int]] = {}
+    for name, arr in arrays.items():
+        nbytes = arr.itemsize * len(arr)
+        shm = SharedMemory(create=True, size=max(1, nbytes))
+        shm.buf[:nbytes] = arr.tobytes()
+        blocks.append(shm)
+        specs[name] = (shm.name, arr.typecode, nbytes)
+    return blocks, (G.directed, G._vlab_names, G._elab_names, specs, extend, heuristics)
+
+
+_WORKER_SHM: List[SharedMemory] = []
+_WORKER_MASK: Optional[bytearray] = None
+
+
+def _init_worker(payload):
+    """Process pool initializer: attach to the shared graph once per worker.
+
+    The worker maps the CSR blocks published by `_share_graph` without
+    copying them, wraps them in a read-only `DataGraph` (see
+    `DataGraph.from_csr`) and keeps it, together with an
+    `EmbeddingEnumerator` over it, in module globals for all later tasks.
+    Pools that run extension chunks (`extend`) also get a generator on the
+    same graph, plus `SoGraMiHeuristics` only if `heuristics` is set, since
+    its neighbor-order memo grows into a per-worker adjacency copy.
+    """
+    global _WORKER_G, _WORKER_EMBEDDER
+    directed, vlab_names, elab_names, specs, extend, heuristics = payload
+    arrays = {}
+    for name, (shm_name, typecode, nbytes) in specs.items():
+        shm = SharedMemory(name=shm_name)
+        # the views borrow the mapping, so the block must outlive them
+        _WORKER_SHM.append(shm)
+        arrays[name] = shm.buf[:nbytes].cast(typecode)
+    G = DataGraph.from_csr(directed, arrays.pop('vlab_id'), vlab_names,
+                           elab_names=elab_names, **arrays)
+    _WORKER_G = G
+    _WORKER_EMBEDDER = EmbeddingEnumerator(G)
+    if extend:
+        _init_extend_worker(CandidateGenerator(G), SoGraMiHeuristics(G) if heuristics else None)
+
+
+def _worker_embeddings(p_vlabels: Tuple[str, ...], edges_u: array, edges_v: array,
+                       edges_label: Tuple[Optional[str], ...]) -> List[Dict[int, int]]:
+    """Worker function used by process pool to compute embeddings.
 
+    Runs `EmbeddingEnumerator.full_mni_embeddings` against the graph
+    installed by `_init_worker`.
+    """
+    p = Pattern.from_columns(p_vlabels, edges_u, edges_v, edges_label, _WORKER_G.directed)
+    return _WORKER_EMBEDDER.full_mni_embeddings(p)
 
-def _worker_embeddings(payload, p_vlabels: List[str], p_edges: List[Edge]) -> List[Dict[int, int]]:
-    """Worker function used by process pool to compute embeddings.
 
-    The process reconstructs a minimal `DataGraph` object from the
-    serialized payload and runs `EmbeddingEnumerator.full_mni_embeddings`.
+def _worker_materialize(node_lists: List[Tuple[int, ...]]) -> List[Tuple[List[int], List[Edge]]]:
+    """Worker function extracting the induced subgraphs of a chunk.
+
+    Each entry holds the graph nodes of one embedding; the node mask is
+    allocated once per worker and reused.
+    """
+    global _WORKER_MASK
+    if _WORKER_MASK is None:
+        _WORKER_MASK = bytearray(len(_WORKER_G.vlabels))
+    out: List[Tuple[List[int], List[Edge]]] = []
+    for vals in node_lists:
+        nodes = sorted(set(vals))
+        out.append((nodes, _induced_edges(_WORKER_G, nodes, _WORKER_MASK)))
+    return out
+
+
+def _worker_embeddings_batch(batch: List[Tuple]) -> List[Tuple[int, List[Dict[int, int]]]]:
+    """Worker function evaluating a bucket of patterns.
+
+    Each entry is `(index, vlabels, edges_u, edges_v, edges_label)`, the
+    pattern in its column form (see `Pattern.from_columns`). Returns
+    `(index, embeddings)` pairs so the caller can restore order.
     """
-    directed, vlabels, adj, rev = payload
-    G = DataGraph(directed, vlabels, [])
-    G.adj = adj
-    G.rev = rev
-    G.lab2nodes = defaultdict(set)
-    for i, lab in enumerate(vlabels):
-        G.lab2nodes[lab].add(i)
-    p = Pattern(p_vlabels, p_edges, directed)
-    return EmbeddingEnumerator(G).full_mni_embeddings(p)
+    return [(i, _worker_embeddings(*columns)) for i, *columns in batch]
 
 
 def subgraph_from_embedding(G: DataGraph, p: Pattern, emb: Dict[int, int], induced: bool = False) -> Tuple[List[int], List[Edge]]:
@@ -115,30 +296,74 @@ def subgraph_from_embedding(G: DataGraph, p: Pattern, emb: Dict[int, int], induc
     selected graph nodes; otherwise they follow the pattern's edges.
     """
     nodes = sorted(set(emb.values()))
-    node_set = set(nodes)
-    edges: List[Edge] = []
     if induced:
-        seen = set()
-        for u in nodes:
-            for v, lab in G.adj[u]:
-                if v in node_set:
-                    if G.directed:
-                        edges.append(Edge(u, v, lab))
-                    else:
-                        a, b = (u, v) if u < v else (v, u)
-                        key = (a, b, lab)
-                        if key not in seen:
-                            seen.add(key)
-                            edges.append(Edge(a, b, lab))
-    else:
-        for e in p.edges:
-            u = emb[e.u]; v = emb[e.v]
-            edges.append(Edge(u, v, e.label))
+        return nodes, _induced_edges(G, nodes, bytearray(len(G.vlabels)))
+    edges: List[Edge] = []
+    for pu, pv, lab in p.iter_edges():
+        edges.append(Edge(emb[pu], emb[pv], lab))
     return nodes, edges
 
 
-def materialize_all_embeddings(G: DataGraph, p: Pattern, embeddings: List[Dict[int, int]], induced: bool = False) -> List[Tuple[List[int], List[Edge]]]:
-    return [subgraph_from_embedding(G, p, emb, induced=induced) for emb in embeddings]
+def _induced_edges(G: DataGraph, nodes: List[int], mask: bytearray) -> List[Edge]:
+    """Return the edges of `G` among `nodes`, scanning their CSR slices.
+
+    `mask` is a zeroed bytearray with one byte per graph node; the bytes
+    of `nodes` are set for the scan and cleared again before returning,
+    so callers can reuse one mask across calls. Neighbors are filtered
+    through the mask by `compress`, keeping the membership test out of
+    the interpreter loop.
+    """
+    indptr, idx, elab, names = G.adj_indptr, G.adj_idx, G.adj_elab, G._elab_names
+    for u in nodes:
+        mask[u] = 1
+    edges: List[Edge] = []
+    seen = set()
+    for u in nodes:
+        lo, hi = indptr[u], indptr[u + 1]
+        for k in compress(range(lo, hi), map(mask.__getitem__, idx[lo:hi])):
+            v = idx[k]
+            lab = names[elab[k]]
+            if G.directed:
+                edges.append(Edge(u, v, lab))
+            else:
+                a, b = (u, v) if u < v else (v, u)
+                key = (a, b, lab)
+                if key not in seen:
+                    seen.add(key)
+                    edges.append(Edge(a, b, lab))
+    for u in nodes:
+        mask[u] = 0
+    return edges
+
+
+def materialize_all_embeddings(G: DataGraph, p: Pattern, embeddings: List[Dict[int, int]], induced: bool = False,
+                               parallel: bool = False, max_workers: int = os.cpu_count() or 2,
+                               chunksize: Optional[int] = None) -> List[Tuple[List[int], List[Edge]]]:
+    """Apply `subgraph_from_embedding` to every embedding, keeping order.
+
+    With `parallel` the induced extraction (the only costly case) is
+    spread over a process pool sharing the graph's CSR arrays; each task
+    receives `chunksize` embeddings, reduced to their graph nodes. Inputs
+    below `PARALLEL_MIN_MATERIALIZE` embeddings are handled serially.
+    """
+    if not induced:
+        return [subgraph_from_embedding(G, p, emb) for emb in embeddings]
+    if not parallel or max_workers <= 1 or len(embeddings) < PARALLEL_MIN_MATERIALIZE:
+        mask = bytearray(len(G.vlabels))
+        out: List[Tuple[List[int], List[Edge]]] = []
+        for emb in embeddings:
+            nodes = sorted(set(emb.values()))
+            out.append((nodes, _induced_edges(G, nodes, mask)))
+        return out
+    if chunksize is None:
+        chunksize = max(1, len(embeddings) // (4 * max_workers))
+    node_lists = [tuple(emb.values()) for emb in embeddings]
+    chunks = [node_lists[i:i + chunksize] for i in range(0, len(node_lists), chunksize)]
+    out = []
+    with _shared_graph_pool(G, max_workers) as ex:
+        for part in ex.map(_worker_materialize, chunks):
+            out.extend(part)
+    return out
 
 
 class SoGraMiHeuristics:
@@ -150,16 +375,39 @@ class SoGraMiHeuristics:
 
     def __init__(self, G: DataGraph):
         self.G = G
-        self.lab_freq: Dict[str, int] = {lab: len(nodes) for lab, nodes in G.lab2nodes.items()}
-        self.deg = [len(G.adj[i]) for i in range(len(G.vlabels))]
+        # both tables come straight from the integer-encoded graph arrays:
+        # label sizes from `lab2nodes_id`, degrees as CSR row lengths
+        self.lab_freq: Dict[str, int] = dict(zip(G._vlab_names, map(len, G.lab2nodes_id)))
+        indptr = G.adj_indptr
+        self.deg: List[int] = list(map(sub, indptr[1:], indptr[:-1]))
+        # the graph does not change while mining, so each vertex's
+        # neighbor order is computed once (see `neighbor_order`)
+        self._order_cache: Dict[int, List[Tuple[int, Optional[str]]]] = {}
 
     def label_rarity(self, lab: str) -> int:
         return self.lab_freq.get(lab, 0)
 
     def neighbor_order(self, u_g: int) -> List[Tuple[int, Optional[str]]]:
-        neigh = list(self.G.adj[u_g])
-        neigh.sort(key=lambda t: (self.label_rarity(self.G.vlabels[t[0]]), -self.deg[t[0]]))
-        return neigh
+        """Return the neighbors of `u_g`, rarest label and highest degree first.
+
+        The list is memoized per vertex and shared between calls; callers
+        must not modify it.
+        """
+        order = self._order_cache.get(u_g)
+        if order is None:
+            order = self._order_cache[u_g] = self._compute_order(u_g)
+        return order
+
+    def _compute_order(self, u_g: int) -> List[Tuple[int, Optional[str]]]:
+        vlab = self.G.vlabels
+        lfreq = self.lab_freq
+        deg = self.deg
+        # decorate-sort-undecorate; the position `i` keeps the sort stable
+        # and stops tuple comparison before the (possibly None) label
+        decorated = [(lfreq.get(vlab[v], 0), -deg[v], i, v, lab)
+                     for i, (v, lab) in enumerate(self.G.adj[u_g])]
+        decorated.sort()
+        return [(t[3], t[4]) for t in decorated]
 
     def degree_prune(self, need_deg: int, cand_deg: int) -> bool:
         return cand_deg >= need_deg
@@ -178,41 +426,34 @@ class SoPaGraMiMiner(SuGraMiMiner):
         super().__init__(G, min_support, max_workers)
         self.heur = SoGraMiHeuristics(G) if use_sorting else None
 
-    def mine(self, parallel: bool = True, max_size: Optional[int] = None) -> Dict[Tuple, Dict]:
+    def mine(self, parallel: bool = True, max_size: Optional[int] = None,
+             prune_covered: bool = False) -> Dict[Tuple, Dict]:
         results: Dict[Tuple, Dict] = {}
+        self._closed_ht = defaultdict(list)
+        heur_arg = self.heur if hasattr(self.candgen, 'extensions') else None
         counts = self.G.edge_type_counts()
-        allowed_edge_types: Set[Tuple[str, str, Optional[str], int]] = {
-            k for k, c in counts.items() if c >= self.min_support
-        }
-        seeds: List[Tuple[Pattern, int]] = []
-        for (lu, lv, el, dflag), c in counts.items():
-            if (lu, lv, el, dflag) not in allowed_edge_types:
-                continue
-            if dflag == 1:
-                p = Pattern([lu, lv], [Edge(0, 1, el)], True)
-            else:
-                p = Pattern([lu, lv], [Edge(0, 1, el)], False)
-            seeds.append((p, c))
-        seeds.sort(key=lambda pc: pc[1], reverse=True)
-        frontier: List[Pattern] = [p for p, _ in seeds]
-
-        while frontier:
-            eval_results = self._evaluate_patterns(frontier, parallel)
-            next_frontier: List[Pattern] = []
-            for p, embeddings in eval_results:
-                supp = self.embedder.mni_support(embeddings, p.num_nodes())
-                if supp >= self.min_support:
-                    full_supp = self.embedder.full_support_count(p)
-                    results[p.key] = {'pattern': p, 'support': supp, 'full_support': full_supp, 'embeddings': embeddings}
-                    if max_size is None or p.num_nodes() < max_size:
-                        for q in self.candgen.extensions(p, embeddings, heur=self.heur if hasattr(self.candgen, 'extensions') else None, allowed_edge_types=allowed_edge_types):
-                            if q.key not in results:
-                                next_frontier.append(q)
-            seen: Set[Tuple] = set()
-            dedup: List[Pattern] = []
-            for q in next_frontier:
-                if q.key not in seen:
-                    seen.add(q.key)
-                    dedup.append(q)
-            frontier = dedup
+        frequent = {k: c for k, c in counts.items() if c >= self.min_support}
+        allowed_edge_types: FrozenSet[Tuple[str, str, Optional[str], int]] = frozenset(frequent)
+        frontier: List[Pattern] = [
+            Pattern((lu, lv), (Edge(0, 1, el),), dflag == 1)
+            for (lu, lv, el, dflag), _ in sorted(frequent.items(), key=itemgetter(1), reverse=True)
+        ]
+
+        with self._worker_pool(parallel) as pool:
+            while frontier:
+                next_frontier: Dict[Tuple, Pattern] = {}
+                for p, embeddings in self._evaluate_patterns(frontier, parallel, pool):
+                    n = p.num_nodes()
+                    supp = self.embedder.mni_support(embeddings, n)
+                    if supp >= self.min_support:
+                        # `embeddings` already lists every injective embedding, so
+                        # its length is the full support (`full_support_count`)
+                        results[p.key] = {'pattern': p, 'support': supp, 'full_support': len(embeddings), 'embeddings': embeddings}
+                        if prune_covered and self._covered(p, embeddings):
+                            continue
+                        if max_size is None or n < max_size:
+                            for q in self.candgen.extensions(p, embeddings, heur=heur_arg, allowed_edge_types=allowed_edge_types, parallel=parallel, executor=pool):
+                                if q.key not in results and q.key not in next_frontier:
+                                    next_frontier[q.key] = q
+                frontier = list(next_frontier.values())
         return results
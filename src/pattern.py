@@ -7,26 +7,123 @@ key used for pattern equivalence (via a DFS-based canonicalization).
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Set
+from array import array
+from typing import FrozenSet, Iterable, Iterator, List, Sequence, Tuple, Optional
 from canonical import _CanonDFSHelper
 from graph import Edge
 
 
+class _CanonicalKey(tuple):
+    """Tuple holding a canonical pattern key that hashes its contents once.
+
+    Plain tuples rehash every nested element on each dict or set lookup,
+    which gets costly as canonical codes grow. The hash equals that of the
+    plain tuple, so both compare and look up interchangeably. It is not
+    pickled: string hashes differ between processes.
+    """
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            h = self._hash = tuple.__hash__(self)
+            return h
+
+    def __reduce__(self):
+        return (_CanonicalKey, (tuple(self),))
+
+
 class Pattern:
     """Container for a graph pattern.
 
     Attributes:
     - directed: whether edges have direction.
-    - vlabels: list of vertex labels (indexed by vertex id in the pattern).
-    - edges: list of `Edge` objects describing the pattern topology.
-    - key: canonical key (tuple) used to compare/uniquely identify patterns.
+    - vlabels: tuple of vertex labels (indexed by vertex id in the pattern).
+    - edges_u, edges_v: `array('i')` columns with the edge endpoints.
+    - edges_label: tuple with the (optional) label of each edge.
+    - edges: tuple of `Edge` objects, rebuilt from the columns on access.
+    - key: canonical key (tuple) used to compare/uniquely identify patterns,
+      computed lazily.
+
+    Edges are stored column-wise rather than as one object per edge, and
+    patterns are never mutated; `child` derives a one-edge extension.
     """
 
-    def __init__(self, vlabels: List[str], edges: List[Edge], directed: bool):
+    def __init__(self, vlabels: Sequence[str], edges: Iterable[Edge], directed: bool):
+        edges = tuple(edges)
+        self._init(
+            tuple(vlabels),
+            array('i', [e[0] for e in edges]),
+            array('i', [e[1] for e in edges]),
+            tuple(e[2] for e in edges),
+            directed,
+        )
+
+    @classmethod
+    def from_columns(cls, vlabels: Tuple[str, ...], edges_u: array, edges_v: array,
+                     edges_label: Tuple[Optional[str], ...], directed: bool) -> "Pattern":
+        """Build a pattern directly from edge columns (taken over, not copied).
+
+        This is the compact form patterns travel in between processes:
+        the `array` columns pickle as raw bytes instead of one `Edge` each.
+        """
+        q = cls.__new__(cls)
+        q._init(vlabels, edges_u, edges_v, edges_label, directed)
+        return q
+
+    def _init(self, vlabels: Tuple[str, ...], edges_u: array, edges_v: array,
+              edges_label: Tuple[Optional[str], ...], directed: bool):
         self.directed = directed
-        self.vlabels = list(vlabels)
-        self.edges = list(edges)
-        self.key = self._canonical_key()
+        self.vlabels = vlabels
+        self.edges_u = edges_u
+        self.edges_v = edges_v
+        self.edges_label = edges_label
+        self._num_nodes = len(vlabels)
+        # canonical key, computed on first access (see `key`)
+        self._key: Optional[_CanonicalKey] = None
+        # normalized edge set, built on first `edge_set()` call
+        self._edge_set: Optional[FrozenSet[Tuple[int, int, Optional[str]]]] = None
+        # right-most path derived from the canonical code; filled lazily
+        # by `CandidateGenerator._rmpath`
+        self._rmpath_cache: Optional[List[int]] = None
+
+    def child(self, edge: Edge, lv: Optional[str] = None) -> "Pattern":
+        """Return a new pattern with `edge` appended.
+
+        If `lv` is given it is the label of a new vertex (the next free id)
+        that `edge` attaches to the pattern.
+        """
+        edges_u = array('i', self.edges_u)
+        edges_u.append(edge.u)
+        edges_v = array('i', self.edges_v)
+        edges_v.append(edge.v)
+        return Pattern.from_columns(
+            self.vlabels if lv is None else self.vlabels + (lv,),
+            edges_u,
+            edges_v,
+            self.edges_label + (edge.label,),
+            self.directed,
+        )
+
+    @property
+    def edges(self) -> Tuple[Edge, ...]:
+        return tuple(map(Edge, self.edges_u, self.edges_v, self.edges_label))
+
+    def iter_edges(self) -> Iterator[Tuple[int, int, Optional[str]]]:
+        """Iterate edges as plain `(u, v, label)` tuples."""
+        return zip(self.edges_u, self.edges_v, self.edges_label)
+
+    @property
+    def key(self) -> Tuple:
+        """Canonical key of the pattern, computed once on first access.
+
+        Canonicalization is the most expensive part of building a pattern;
+        patterns that are only matched against the graph (e.g. the copies
+        rebuilt in embedding workers) never pay for it.
+        """
+        if self._key is None:
+            self._key = self._canonical_key()
+        return self._key
 
     def _canonical_key(self) -> Tuple:
         """Return a canonical, comparable key for this pattern.
@@ -35,19 +132,24 @@ class Pattern:
         the directed flag plus the canonical DFS enumeration. This key is
         used throughout the codebase to deduplicate isomorphic patterns.
         """
-        canon = _CanonDFSHelper(self.directed, self.vlabels, self.edges).canonical_code()
-        return (self.directed, tuple(canon))
+        canon = _CanonDFSHelper(self.directed, self.vlabels, self.iter_edges()).canonical_code()
+        return _CanonicalKey((self.directed, tuple(canon)))
 
     def num_nodes(self) -> int:
         """Return number of vertices in the pattern."""
-        return len(self.vlabels)
+        return self._num_nodes
 
-    def edge_set(self) -> Set[Tuple[int, int, Optional[str]]]:
+    def edge_set(self) -> FrozenSet[Tuple[int, int, Optional[str]]]:
         """Return a set of edges suitable for quick membership checks.
 
         For undirected patterns the edges are normalized so that (u,v)
-        is always ordered (min, max).
+        is always ordered (min, max). The set is computed once and shared
+        between calls, hence frozen.
         """
-        if self.directed:
-            return {(e.u, e.v, e.label) for e in self.edges}
-        return {(min(e.u, e.v), max(e.u, e.v), e.label) for e in self.edges}
+        if self._edge_set is None:
+            if self.directed:
+                self._edge_set = frozenset(self.iter_edges())
+            else:
+                self._edge_set = frozenset((u, v, lab) if u <= v else (v, u, lab)
+                                           for u, v, lab in self.iter_edges())
+        return self._edge_set